@@ -1,12 +1,22 @@
 import pandas as pd
+import numpy as np
 import os
-import pickle
 import hashlib
-import schedule
+import io
+import threading
 import time
 from datetime import datetime, timedelta
 import smtplib
 from email.mime.text import MIMEText
+from string import Template
+from watchdog.events import (
+    FileClosedEvent,
+    FileCreatedEvent,
+    FileModifiedEvent,
+    FileMovedEvent,
+    FileSystemEventHandler,
+)
+from watchdog.observers import Observer
 
 ##############################
 # CONFIGURATION
@@ -14,8 +24,17 @@ from email.mime.text import MIMEText
 
 EXCEL_PATH = r"path\to\your_issuance_file.xlsx"
 CHANGES_LOG_PATH = "changes_log.txt"
-LAST_DATA_PICKLE = "last_data.pkl"
+LAST_DATA_PATH = "last_data.feather"
+LAST_SIDECAR_PATH = "last_data.npz"
 LAST_HASH_FILE = "last_hash.txt"
+LAST_MTIME_FILE = "last_mtime.txt"
+
+# Parsed DataFrames cached on disk, keyed by the Excel file hash
+CACHE_DIR = "cache"
+CACHE_MAX_ENTRIES = 5
+# Bump whenever prepare_data() or the read_excel arguments change,
+# so entries parsed by older code are no longer served
+CACHE_VERSION = 3
 
 # Email settings
 SMTP_SERVER = "smtp.yourdomain.com"
@@ -26,65 +45,211 @@ EMAIL_PASSWORD = "your_email_password"
 # Who gets the overdue/failure emails
 ADMIN_EMAILS = ["admin1@yourdomain.com", "admin2@yourdomain.com"]
 
+# Email bodies, filled in per run
+WARNING_TEMPLATE = Template(
+    "Hello $name (Roll No: $roll_number),\n\n"
+    "This is a reminder that your item is due tomorrow. "
+    "Please ensure you return it on time.\n\n"
+    "Regards,\nIssuance System"
+)
+FAILURE_TEMPLATE = Template(
+    "The following $count roll number(s) have failed to return their item:\n\n"
+    "$roll_numbers\n\n"
+    "They are now eligible for a no-due fine.\n\n"
+    "Regards,\nIssuance System"
+)
+
+# Seconds to wait after the last file event before re-checking
+# (saving from Excel can emit several events in a row)
+DEBOUNCE_SECONDS = 2
+
+# How often to re-evaluate due dates when the file has not changed
+HEARTBEAT_SECONDS = 60 * 60
+
 ##############################
 # HELPER FUNCTIONS
 ##############################
 
-def compute_file_hash(file_path):
+def prepare_data(df):
     """
-    Compute SHA256 hash of the given file to detect tampering or changes.
+    Normalizes a freshly parsed Excel DataFrame (column types etc.).
     """
-    sha256_hash = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
-    return sha256_hash.hexdigest()
+    # For consistency, ensure we work with predictable columns and types
+    # Example: rename columns if needed, or confirm they are as expected:
+    # df.columns = [
+    #     "Name", "Roll Number", "RFID Tag", 
+    #     "Date of Issuing", "Date of Return", "Email", "Returned"
+    # ]
+    
+    # Convert date columns to datetime just in case parse_dates left them as text
+    for col in ("Date of Issuing", "Date of Return"):
+        if not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], errors="coerce")
 
+    # Hand-edited columns can mix numbers and text (e.g. RFID tags 12345 and "X2"),
+    # which Feather cannot store; keep every text column as plain strings.
+    for col in df.select_dtypes(include="object").columns:
+        df[col] = df[col].where(df[col].isna(), df[col].astype(str))
 
-def send_email(subject, body, to_addrs):
+    # Normalize the returned flag once so status checks compare category codes
+    df["Returned"] = df["Returned"].astype(str).str.strip().str.lower().astype("category")
+    return df
+
+
+def evict_cache():
+    """
+    Removes the least recently used cached DataFrames beyond CACHE_MAX_ENTRIES.
+    """
+    entries = [
+        os.path.join(CACHE_DIR, name)
+        for name in os.listdir(CACHE_DIR)
+        if name.endswith(".pkl")
+    ]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for path in entries[CACHE_MAX_ENTRIES:]:
+        os.remove(path)
+
+
+def read_and_hash(file_path):
+    """
+    Reads the Excel file once, computing its SHA256 hash (to detect
+    tampering or changes) from the same bytes that are parsed into a DataFrame.
+    If a prepared DataFrame for this hash is already cached, parsing is skipped.
+    Returns (DataFrame, hex digest).
+    """
+    with open(file_path, "rb") as f:
+        buf = io.BytesIO(f.read())
+    # file_digest hashes the in-memory buffer in C without a Python read loop
+    digest = hashlib.file_digest(buf, "sha256").hexdigest()
+
+    cache_path = os.path.join(CACHE_DIR, f"v{CACHE_VERSION}-{digest}.pkl")
+    if os.path.exists(cache_path):
+        try:
+            df = pd.read_pickle(cache_path)
+        except Exception as e:
+            # A damaged entry counts as a cache miss
+            print(f"Discarding unreadable cache entry {cache_path}: {e}")
+            os.remove(cache_path)
+        else:
+            os.utime(cache_path)  # mark as recently used
+            return df, digest
+
+    buf.seek(0)
+    # pandas' openpyxl reader already opens workbooks read_only/data_only;
+    # typed columns and parse_dates save separate conversion passes afterwards
+    df = prepare_data(pd.read_excel(
+        buf,
+        engine="openpyxl",
+        dtype={"Roll Number": str, "Email": str},
+        parse_dates=["Date of Issuing", "Date of Return"],
+    ))
+
+    # Write to a temporary file first so a crash never leaves a truncated entry
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    df.to_pickle(tmp_path)
+    os.replace(tmp_path, cache_path)
+    evict_cache()
+    return df, digest
+
+
+def send_emails(messages):
     """
-    Sends an email with the specified subject and body to the given recipients.
+    Sends a batch of (subject, body, to_addrs) emails over a single SMTP session.
+    A failure on one message does not stop the remaining ones from being sent.
     """
-    msg = MIMEText(body)
-    msg["Subject"] = subject
-    msg["From"] = EMAIL_ADDRESS
-    msg["To"] = ", ".join(to_addrs)
+    if not messages:
+        return
 
     try:
         with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
             server.starttls()
             server.login(EMAIL_ADDRESS, EMAIL_PASSWORD)
-            server.sendmail(EMAIL_ADDRESS, to_addrs, msg.as_string())
+            for subject, body, to_addrs in messages:
+                try:
+                    msg = MIMEText(body)
+                    msg["Subject"] = subject
+                    msg["From"] = EMAIL_ADDRESS
+                    msg["To"] = ", ".join(to_addrs)
+                    server.sendmail(EMAIL_ADDRESS, to_addrs, msg.as_string())
+                except Exception as e:
+                    print(f"Error sending email to {to_addrs}: {e}")
     except Exception as e:
         print(f"Error sending email: {e}")
 
 
-def log_change(change_message):
+def log_change(log_file, timestamp, change_message):
     """
-    Appends a change message to the changes_log.txt file with a timestamp.
+    Writes a change message with a timestamp to the open changes log.
     """
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(CHANGES_LOG_PATH, "a") as log_file:
-        log_file.write(f"[{timestamp}] {change_message}\n")
+    log_file.write(f"[{timestamp}] {change_message}\n")
+
+
+def log_rows(log_file, timestamp, change_message, rows):
+    """
+    Writes one line per row of the given DataFrame slice to the open changes log,
+    serializing all rows in a single pass and writing them at once.
+    """
+    records = rows.to_json(orient="records", lines=True, date_format="iso").splitlines()
+    log_file.write("".join(
+        f"[{timestamp}] {change_message} {r}: {record}\n"
+        for r, record in zip(rows.index, records)
+    ))
 
 
 def load_previous_data():
     """
-    Loads previously stored DataFrame from a pickle file (if exists).
+    Loads previously stored DataFrame from a Feather file (if exists).
     Returns None if not found.
     """
-    if os.path.exists(LAST_DATA_PICKLE):
-        with open(LAST_DATA_PICKLE, "rb") as f:
-            return pickle.load(f)
+    if os.path.exists(LAST_DATA_PATH):
+        return pd.read_feather(LAST_DATA_PATH)
     return None
 
 
-def save_current_data(df):
+def save_current_data(df, row_hashes):
+    """
+    Saves current DataFrame to a Feather file, plus a sidecar with its row
+    hashes, shape and column names, for next comparison.
+    Both are written to temporary files first and only then moved into place
+    (sidecar last), so a failed write never leaves a truncated file or a
+    sidecar describing different data than the Feather file.
+    """
+    data_tmp = LAST_DATA_PATH + ".tmp"
+    sidecar_tmp = LAST_SIDECAR_PATH + ".tmp"
+    df.reset_index(drop=True).to_feather(data_tmp)
+    with open(sidecar_tmp, "wb") as f:
+        np.savez(
+            f,
+            rowhash=row_hashes,
+            shape=np.array(df.shape),
+            cols=np.array([str(c) for c in df.columns]),
+        )
+    os.replace(data_tmp, LAST_DATA_PATH)
+    os.replace(sidecar_tmp, LAST_SIDECAR_PATH)
+
+
+def compute_row_hashes(df):
+    """
+    Computes one 64-bit hash per row so unchanged rows can be skipped when diffing.
+    """
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def load_previous_sidecar():
     """
-    Saves current DataFrame to a pickle file for next comparison.
+    Loads the row hashes, shape and column names stored on the last run
+    (if exists). Much cheaper than loading the full previous DataFrame.
+    Returns None if not found.
     """
-    with open(LAST_DATA_PICKLE, "wb") as f:
-        pickle.dump(df, f)
+    if os.path.exists(LAST_SIDECAR_PATH):
+        with np.load(LAST_SIDECAR_PATH) as sidecar:
+            return {
+                "rowhash": sidecar["rowhash"],
+                "shape": tuple(int(n) for n in sidecar["shape"]),
+                "cols": sidecar["cols"].tolist(),
+            }
+    return None
 
 
 def load_previous_hash():
@@ -105,131 +270,285 @@ def save_current_hash(h):
         f.write(h)
 
 
+def load_previous_mtime():
+    """
+    Loads the last known file modification time in nanoseconds (if exists).
+    """
+    if os.path.exists(LAST_MTIME_FILE):
+        with open(LAST_MTIME_FILE, "r") as f:
+            value = f.read().strip()
+            if value.isdigit():
+                return int(value)
+    return None
+
+
+def save_current_mtime(mtime_ns):
+    """
+    Stores the current file modification time in nanoseconds.
+    """
+    with open(LAST_MTIME_FILE, "w") as f:
+        f.write(str(mtime_ns))
+
+
+# DataFrame from the last successful run, kept in memory so that an
+# unchanged file does not need to be re-read for the date checks.
+_cached_df = None
+
+
 ##############################
 # CORE LOGIC
 ##############################
 
-def check_excel():
+def check_excel(notify=True):
     """
     1) Checks if the Excel file hash changed (possible tampering).
     2) If changed, compare row-by-row to log modifications.
     3) Send warning emails for items due tomorrow.
     4) Send 'failure' emails for items not returned after due date.
+
+    If the file's modification time is unchanged since the last run, steps
+    1 and 2 are skipped and the date checks run against the cached data.
+    With notify=False (runs triggered by file edits) steps 3 and 4 are skipped.
     """
-    # ---- A) Check file hash for tampering or changes ----
-    current_hash = compute_file_hash(EXCEL_PATH)
+    global _cached_df
+
+    # ---- 0) Skip hashing/parsing if the file has not been touched ----
+    current_mtime = os.stat(EXCEL_PATH).st_mtime_ns
+    if current_mtime == load_previous_mtime():
+        if not notify:
+            return
+        if _cached_df is None:
+            _cached_df = load_previous_data()
+        if _cached_df is not None:
+            check_due_dates(_cached_df)
+            return
+
+    # ---- A) Read Excel data & check file hash for tampering or changes ----
+    df_current, current_hash = read_and_hash(EXCEL_PATH)
     previous_hash = load_previous_hash()
 
-    if previous_hash and current_hash != previous_hash:
-        # Possible file tampering or simply a legitimate update
-        log_change("File hash changed - possible tampering or new entries.")
-        print("WARNING: Excel file hash has changed. Checking row-by-row differences...")
+    # All change messages of this run go through one buffered handle
+    # and share one timestamp.
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with open(CHANGES_LOG_PATH, "a", buffering=1 << 16) as log_file:
+
+        if previous_hash and current_hash != previous_hash:
+            # Possible file tampering or simply a legitimate update
+            log_change(log_file, timestamp,
+                       "File hash changed - possible tampering or new entries.")
+            print("WARNING: Excel file hash has changed. Checking row-by-row differences...")
+
+        # ---- B) Compare row-by-row to log changes ----
+        # The sidecar answers "did anything change?" without loading the
+        # previous DataFrame; it is only read when old values must be shown.
+        row_hashes = compute_row_hashes(df_current)
+        sidecar = load_previous_sidecar()
+        df_previous = None
+        if sidecar is None:
+            df_previous = load_previous_data()
+            if df_previous is not None:
+                sidecar = {
+                    "rowhash": None,
+                    "shape": df_previous.shape,
+                    "cols": [str(c) for c in df_previous.columns],
+                }
+
+        if sidecar is not None:
+            previous_shape = sidecar["shape"]
+            previous_rows = previous_shape[0]
+
+            # Compare shapes first
+            if df_current.shape != previous_shape:
+                log_change(log_file, timestamp,
+                           f"Row/column count changed from {previous_shape} to {df_current.shape}.")
+            current_cols = [str(c) for c in df_current.columns]
+            if current_cols != sidecar["cols"]:
+                log_change(log_file, timestamp,
+                           f"Columns changed from {sidecar['cols']} to {current_cols}.")
+
+            # We'll compare each cell for differences
+            #  - We assume the same indexing/ordering in the sheet.  
+            #  - For more robust comparisons, you might match by unique ID (e.g., Roll Number + RFID).
+            min_rows = min(len(df_current), previous_rows)
+            min_cols = min(len(df_current.columns), previous_shape[1])
+
+            # Only rows whose hash differs from last run need a cell-by-cell diff.
+            # Without stored hashes for the previous data, every row is compared.
+            if sidecar["rowhash"] is not None and len(sidecar["rowhash"]) == previous_rows:
+                changed_rows = np.flatnonzero(
+                    row_hashes[:min_rows] != sidecar["rowhash"][:min_rows]
+                )
+            else:
+                changed_rows = np.arange(min_rows)
+
+            if df_previous is None and (len(changed_rows) or len(df_current) < previous_rows):
+                df_previous = load_previous_data()
+                if df_previous is None:
+                    log_change(log_file, timestamp,
+                               "Previous data missing. Changed values cannot be shown.")
+
+            if df_previous is not None:
+                # Align both frames positionally so the comparison runs column-wise in C.
+                df_a = df_current.iloc[changed_rows, :min_cols].reset_index(drop=True)
+                df_b = df_previous.iloc[changed_rows, :min_cols].reset_index(drop=True)
+                df_b.columns = df_a.columns
+
+                # Categorical columns can only be compared when their categories match
+                df_a = df_a.astype({c: object for c in df_a.select_dtypes("category").columns})
+                df_b = df_b.astype({c: object for c in df_b.select_dtypes("category").columns})
+
+                # Empty cells on both sides count as unchanged.
+                changed = df_a.ne(df_b) & ~(df_a.isna() & df_b.isna())
+                values_current = df_a.to_numpy()
+                values_previous = df_b.to_numpy()
+                for i, col in zip(*np.nonzero(changed.to_numpy())):
+                    log_change(
+                        log_file, timestamp,
+                        f"Row {changed_rows[i]}, Col {col} changed from "
+                        f"'{values_previous[i, col]}' to '{values_current[i, col]}'."
+                    )
+
+                if len(df_current) < previous_rows:
+                    log_rows(log_file, timestamp, "Row removed at old index",
+                             df_previous.iloc[len(df_current):])
+
+            # New rows only need the current data
+            if len(df_current) > previous_rows:
+                log_rows(log_file, timestamp, "New row added at index",
+                         df_current.iloc[previous_rows:])
+        else:
+            # No previous data => first run
+            log_change(log_file, timestamp,
+                       "No previous data found. Initializing data storage.")
+
+    # ---- C) Save current data, hashes & mtime for next run ----
+    save_current_data(df_current, row_hashes)
+    save_current_hash(current_hash)
+    save_current_mtime(current_mtime)
+    _cached_df = df_current
 
-    # ---- B) Read current Excel data ----
-    df_current = pd.read_excel(EXCEL_PATH)
-    
-    # For consistency, ensure we work with predictable columns and types
-    # Example: rename columns if needed, or confirm they are as expected:
-    # df_current.columns = [
-    #     "Name", "Roll Number", "RFID Tag", 
-    #     "Date of Issuing", "Date of Return", "Email", "Returned"
-    # ]
-    
-    # Convert date columns to datetime just in case
-    df_current["Date of Issuing"] = pd.to_datetime(df_current["Date of Issuing"], errors="coerce")
-    df_current["Date of Return"] = pd.to_datetime(df_current["Date of Return"], errors="coerce")
-    
-    # ---- C) Compare row-by-row to log changes ----
-    df_previous = load_previous_data()
-
-    if df_previous is not None:
-        # Compare shapes first
-        if df_current.shape != df_previous.shape:
-            log_change(f"Row/column count changed from {df_previous.shape} to {df_current.shape}.")
-
-        # We'll compare each cell for differences
-        #  - We assume the same indexing/ordering in the sheet.  
-        #  - For more robust comparisons, you might match by unique ID (e.g., Roll Number + RFID).
-        min_rows = min(len(df_current), len(df_previous))
-        min_cols = min(len(df_current.columns), len(df_previous.columns))
-
-        for row in range(min_rows):
-            for col in range(min_cols):
-                val_current = df_current.iat[row, col]
-                val_previous = df_previous.iat[row, col]
-                if val_current != val_previous:
-                    log_change(f"Row {row}, Col {col} changed from '{val_previous}' to '{val_current}'.")
-        
-        # If new rows were added or old rows removed, log them
-        if len(df_current) > len(df_previous):
-            for r in range(len(df_previous), len(df_current)):
-                log_change(f"New row added at index {r}: {df_current.iloc[r].to_dict()}")
-        elif len(df_current) < len(df_previous):
-            for r in range(len(df_current), len(df_previous)):
-                log_change(f"Row removed at old index {r}: {df_previous.iloc[r].to_dict()}")
-    else:
-        # No previous data => first run
-        log_change("No previous data found. Initializing data storage.")
+    # ---- D) Check Dates for Warnings & Failures ----
+    if notify:
+        check_due_dates(df_current)
 
-    # ---- D) Save current data & hash for next run ----
-    save_current_data(df_current)
-    save_current_hash(current_hash)
 
-    # ---- E) Check Dates for Warnings & Failures ----
-    today = datetime.now().date()
+def check_due_dates(df_current):
+    """
+    Sends warning emails for items due tomorrow and 'failure' emails
+    for items not returned after the due date.
+    """
+    messages = []
+    today = pd.Timestamp(datetime.now().date())
     tomorrow = today + timedelta(days=1)
 
-    # We'll iterate through each row
-    for idx, row in df_current.iterrows():
-        # Make sure we have a valid date
-        return_date = row["Date of Return"]
-        returned_flag = str(row["Returned"]).strip().lower()
-        roll_number = row["Roll Number"]
-        email = row["Email"]
+    # Build boolean masks over whole columns instead of iterating row by row.
+    # Rows without a valid return date (NaT) never match either mask.
+    return_date = df_current["Date of Return"].dt.normalize()
+    returned = df_current["Returned"]
+    if not isinstance(returned.dtype, pd.CategoricalDtype):
+        returned = returned.astype(str).str.strip().str.lower().astype("category")
+    if "yes" in returned.cat.categories:
+        not_returned = returned.cat.codes != returned.cat.categories.get_loc("yes")
+    else:
+        not_returned = pd.Series(True, index=returned.index)
+
+    due_tomorrow = (return_date == tomorrow) & not_returned
+    overdue = (return_date < today) & not_returned
 
-        if pd.isnull(return_date):
-            # If there's no return date, skip
+    # 1) If the return date is *tomorrow* => send a warning
+    for name, roll_number, email in df_current.loc[
+        due_tomorrow, ["Name", "Roll Number", "Email"]
+    ].itertuples(index=False):
+        if pd.isna(email) or not str(email).strip():
+            print(f"No email address for Roll No {roll_number}; skipping due-tomorrow reminder.")
             continue
+        subject = "Return Due Tomorrow"
+        body = WARNING_TEMPLATE.substitute(name=name, roll_number=roll_number)
+        messages.append((subject, body, [email]))
 
-        return_date_only = return_date.date()
-
-        # 1) If the return date is *tomorrow* => send a warning
-        if return_date_only == tomorrow and returned_flag != "yes":
-            subject = "Return Due Tomorrow"
-            body = (
-                f"Hello {row['Name']} (Roll No: {roll_number}),\n\n"
-                "This is a reminder that your item is due tomorrow. "
-                "Please ensure you return it on time.\n\n"
-                "Regards,\nIssuance System"
-            )
-            send_email(subject, body, [email])
-
-        # 2) If the return date is *before today* => item is overdue
-        if return_date_only < today and returned_flag != "yes":
-            subject = "Failure of Returning"
-            body = (
-                f"Roll Number {roll_number} has failed to return the item.\n\n"
-                "They are now eligible for a no-due fine.\n\n"
-                "Regards,\nIssuance System"
-            )
-            # Send to Admin(s) or a group of people
-            send_email(subject, body, ADMIN_EMAILS)
+    # 2) If the return date is *before today* => item is overdue.
+    #    All overdue items go to the Admin(s) as a single digest email.
+    overdue_rolls = df_current.loc[overdue, "Roll Number"].astype(str).tolist()
+    if overdue_rolls:
+        count = len(overdue_rolls)
+        subject = f"Failure of Returning - {count} item{'s' if count != 1 else ''}"
+        body = FAILURE_TEMPLATE.substitute(
+            count=count,
+            roll_numbers="\n".join(f"- {r}" for r in overdue_rolls),
+        )
+        messages.append((subject, body, ADMIN_EMAILS))
+
+    send_emails(messages)
 
 
 ##############################
 # SCHEDULING & MAIN
 ##############################
 
+# Serializes runs triggered by file events and by the heartbeat
+_check_lock = threading.Lock()
+
+
+def run_check(notify=True):
+    """
+    Runs check_excel(), never concurrently with itself.
+    """
+    with _check_lock:
+        try:
+            check_excel(notify)
+        except Exception as e:
+            print(f"Error checking Excel file: {e}")
+
+
+class ExcelChangeHandler(FileSystemEventHandler):
+    """
+    Triggers a (debounced) check whenever the Excel file is written or replaced.
+    These checks only diff and log; emails are left to the hourly heartbeat.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._target = os.path.abspath(EXCEL_PATH)
+        self._timer = None
+
+    def _schedule_check(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(DEBOUNCE_SECONDS, run_check, kwargs={"notify": False})
+        self._timer.daemon = True
+        self._timer.start()
+
+    def on_any_event(self, event):
+        # Only writes count; opens and read-only closes (e.g. our own read of
+        # the workbook) must not trigger another check.
+        if isinstance(event, FileMovedEvent):
+            # Excel often saves via a temp file that is then renamed over the original
+            path = event.dest_path
+        elif isinstance(event, (FileModifiedEvent, FileCreatedEvent, FileClosedEvent)):
+            path = event.src_path
+        else:
+            return
+        if os.path.abspath(path) == self._target:
+            self._schedule_check()
+
+
 def main():
     # Run immediately once
-    check_excel()
+    run_check()
 
-    # Schedule to run every 1 hour
-    schedule.every(1).hours.do(check_excel)
+    # Re-check whenever the file changes
+    observer = Observer()
+    observer.schedule(ExcelChangeHandler(), os.path.dirname(os.path.abspath(EXCEL_PATH)))
+    observer.start()
 
-    while True:
-        schedule.run_pending()
-        time.sleep(60)  # Check once per minute if it's time to run
+    # Hourly heartbeat for the due-date emails; an unchanged file is not re-read
+    try:
+        while True:
+            time.sleep(HEARTBEAT_SECONDS)
+            run_check()
+    finally:
+        observer.stop()
+        observer.join()
 
 if __name__ == "__main__":
     main()